@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -102,6 +104,34 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/#using-argon2-with-django
+# Django's default hashers with Argon2 (argon2-cffi) moved first; existing
+# PBKDF2 hashes keep working and are upgraded on the user's next successful login.
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Holds the JWT blacklist and the verified-token/user caches. The default
+# local-memory cache is per process; set REDIS_URL so every worker shares them.
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -127,6 +157,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom user model
 AUTH_USER_MODEL = 'users.User'
 
+# Test runner (uses a fast password hasher)
+TEST_RUNNER = 'backend.test_runner.FastPasswordHasherRunner'
+
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -138,8 +171,13 @@ REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
     ],
+    'EXCEPTION_HANDLER': 'users.exceptions.logging_exception_handler',
 }
 
+# orjson is an optional speedup for response rendering
+if find_spec('orjson') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ['users.renderers.ORJSONRenderer']
+
 # JWT Configuration
 JWT_SECRET_KEY = SECRET_KEY  # In production, use a separate strong key
 JWT_ACCESS_TOKEN_LIFETIME = 24 * 60 * 60  # 24 hours in seconds
@@ -0,0 +1,22 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class FastPasswordHasherRunner(DiscoverRunner):
+    """
+    Test runner that swaps in a fast password hasher for the whole run.
+    
+    Tests don't need a slow, secure hash; user creation dominates their
+    runtime otherwise.
+    """
+    
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._hasher_override = override_settings(
+            PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']
+        )
+        self._hasher_override.enable()
+    
+    def teardown_test_environment(self, **kwargs):
+        self._hasher_override.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 04:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_order_vehicle_created_id_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='delivery',
+            index=models.Index(fields=['driver', 'status'], name='deliveries_driver__09f155_idx'),
+        ),
+    ]
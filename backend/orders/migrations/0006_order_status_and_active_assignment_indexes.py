@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-15 04:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_delivery_driver_status_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='driverassignment',
+            index=models.Index(condition=models.Q(('end_date__isnull', True)), fields=['driver', 'vehicle'], name='driverassign_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer', 'status', '-created_at'], name='orders_custome_83fc6c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', '-created_at'], name='orders_status_f8c8df_idx'),
+        ),
+    ]
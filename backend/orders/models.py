@@ -34,6 +34,9 @@ class Vehicle(models.Model):
         verbose_name = 'Vehicle'
         verbose_name_plural = 'Vehicles'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
     
     def __str__(self):
         driver_info = f" - Driver: {self.driver.username}" if self.driver else " - Unassigned"
@@ -58,6 +61,13 @@ class DriverAssignment(models.Model):
         verbose_name = 'Driver Assignment'
         verbose_name_plural = 'Driver Assignments'
         unique_together = ['driver', 'vehicle', 'start_date']
+        indexes = [
+            models.Index(
+                fields=['driver', 'vehicle'],
+                condition=models.Q(end_date__isnull=True),
+                name='driverassign_active_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.driver.username} -> {self.vehicle.plate_number}"
@@ -97,9 +107,23 @@ class Order(models.Model):
         verbose_name = 'Order'
         verbose_name_plural = 'Orders'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['customer', 'status', '-created_at']),
+            models.Index(fields=['status', '-created_at']),
+        ]
     
     def __str__(self):
         return f"Order #{self.id} - {self.customer.username} ({self.status})"
+    
+    def get_cached_delivery(self):
+        """
+        Return the delivery loaded via select_related('delivery'), or None.
+        
+        Never triggers a query, so callers must fetch the order with
+        select_related('delivery') for the result to be meaningful.
+        """
+        return self._meta.get_field('delivery').get_cached_value(self, default=None)
 
 
 class Delivery(models.Model):
@@ -140,6 +164,9 @@ class Delivery(models.Model):
         verbose_name = 'Delivery'
         verbose_name_plural = 'Deliveries'
         ordering = ['-assigned_at']
+        indexes = [
+            models.Index(fields=['driver', 'status']),
+        ]
     
     def __str__(self):
         return f"Delivery #{self.id} - Order #{self.order.id} ({self.status})"
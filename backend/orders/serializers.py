@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db.models import F
 from django.utils import timezone
 from datetime import timedelta
 from .models import Vehicle, DriverAssignment, Order, Delivery, TrackingLog
@@ -157,6 +158,41 @@ class OrderSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'customer', 'created_at', 'updated_at']
 
 
+class OrderListSerializer(serializers.Serializer):
+    """
+    Read-only serializer for order rows fetched with .values().
+    
+    Emits the same fields as OrderSerializer without hydrating Order
+    instances; see ORDER_LIST_VALUES for the matching queryset columns.
+    """
+    
+    id = serializers.IntegerField()
+    customer = serializers.IntegerField()
+    customer_name = serializers.CharField()
+    customer_email = serializers.CharField()
+    delivery_address = serializers.CharField()
+    pickup_address = serializers.CharField()
+    quantity_kg = serializers.FloatField()
+    status = serializers.CharField()
+    scheduled_time = serializers.DateTimeField()
+    customer_phone = serializers.CharField()
+    special_instructions = serializers.CharField()
+    created_at = serializers.DateTimeField()
+    updated_at = serializers.DateTimeField()
+
+
+# Columns to pass to Order.objects.values() for OrderListSerializer
+ORDER_LIST_VALUES = (
+    'id', 'customer', 'delivery_address', 'pickup_address', 'quantity_kg',
+    'status', 'scheduled_time', 'customer_phone', 'special_instructions',
+    'created_at', 'updated_at'
+)
+ORDER_LIST_EXPRESSIONS = {
+    'customer_name': F('customer__username'),
+    'customer_email': F('customer__email'),
+}
+
+
 class OrderStatusUpdateSerializer(serializers.ModelSerializer):
     """Serializer for updating order status."""
     
@@ -214,7 +250,7 @@ class DeliveryAssignmentSerializer(serializers.Serializer):
     def validate_order_id(self, value):
         """Validate order exists and is pending."""
         try:
-            order = Order.objects.get(id=value)
+            order = Order.objects.select_related('delivery').get(id=value)
         except Order.DoesNotExist:
             raise serializers.ValidationError("Order not found.")
         
@@ -222,7 +258,7 @@ class DeliveryAssignmentSerializer(serializers.Serializer):
             raise serializers.ValidationError("Only pending orders can be assigned.")
         
         # Check if order already has a delivery
-        if hasattr(order, 'delivery'):
+        if order.get_cached_delivery() is not None:
             raise serializers.ValidationError("Order already has an assigned delivery.")
         
         return value
@@ -5,9 +5,11 @@ from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
 from datetime import timedelta
+from unittest import mock
 import json
 
 from .models import Vehicle, DriverAssignment, Order, Delivery, TrackingLog
+from .serializers import OrderSerializer
 from users.jwt_service import JWTService
 
 User = get_user_model()
@@ -226,6 +228,61 @@ class OrderAPITestCase(APITestCase):
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['id'], order.id)
     
+    def test_list_orders_invalid_cursor(self):
+        """Test that a malformed pagination cursor returns 404."""
+        url = reverse('orders:list_orders')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.get_auth_header(self.customer_tokens)
+        )
+        
+        response = self.client.get(url, {'cursor': 'not-a-cursor'})
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_list_orders_matches_order_serializer(self):
+        """Test list rows have the same shape as the order detail serializer."""
+        order = Order.objects.create(
+            customer=self.customer,
+            delivery_address='123 Test Street',
+            quantity_kg=25.0,
+            scheduled_time=timezone.now() + timedelta(hours=2),
+            special_instructions='Call when arriving'
+        )
+        
+        url = reverse('orders:list_orders')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.get_auth_header(self.customer_tokens)
+        )
+        
+        response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(dict(response.data['results'][0]), dict(OrderSerializer(order).data))
+    
+    def test_get_order_of_other_customer_not_found(self):
+        """Test customers cannot see orders belonging to someone else."""
+        other_customer = User.objects.create_user(
+            username='othercustomer',
+            email='other@test.com',
+            password='testpass123',
+            role='CUSTOMER'
+        )
+        order = Order.objects.create(
+            customer=other_customer,
+            delivery_address='456 Other Street',
+            quantity_kg=25.0,
+            scheduled_time=timezone.now() + timedelta(hours=2)
+        )
+        
+        url = reverse('orders:get_order', kwargs={'order_id': order.id})
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.get_auth_header(self.customer_tokens)
+        )
+        
+        response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
     def test_assign_driver_success(self):
         """Test successful driver assignment by dispatcher."""
         # Create a test order
@@ -256,6 +313,85 @@ class OrderAPITestCase(APITestCase):
         order.refresh_from_db()
         self.assertEqual(order.status, 'ASSIGNED')
     
+    def test_assign_driver_uses_current_vehicle(self):
+        """Test assigning a driver without a vehicle uses their active assignment."""
+        order = Order.objects.create(
+            customer=self.customer,
+            delivery_address='123 Test Street',
+            quantity_kg=25.0,
+            scheduled_time=timezone.now() + timedelta(hours=2)
+        )
+        
+        url = reverse('orders:assign_driver')
+        data = {
+            'order_id': order.id,
+            'driver_id': self.driver.id
+        }
+        
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.get_auth_header(self.dispatcher_tokens)
+        )
+        
+        response = self.client.post(url, data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['delivery']['vehicle'], self.vehicle.id)
+    
+    def test_assign_driver_auto_selects_available_driver(self):
+        """Test assignment without a driver picks a free driver and their vehicle."""
+        order = Order.objects.create(
+            customer=self.customer,
+            delivery_address='123 Test Street',
+            quantity_kg=25.0,
+            scheduled_time=timezone.now() + timedelta(hours=2)
+        )
+        
+        url = reverse('orders:assign_driver')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.get_auth_header(self.dispatcher_tokens)
+        )
+        
+        response = self.client.post(url, {'order_id': order.id}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['delivery']['driver'], self.driver.id)
+        self.assertEqual(response.data['delivery']['vehicle'], self.vehicle.id)
+        
+        # The driver is now busy, so a second order cannot be auto-assigned
+        second_order = Order.objects.create(
+            customer=self.customer,
+            delivery_address='456 Test Street',
+            quantity_kg=25.0,
+            scheduled_time=timezone.now() + timedelta(hours=2)
+        )
+        
+        response = self.client.post(url, {'order_id': second_order.id}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_assign_driver_order_deleted_before_lock(self):
+        """Test an order deleted mid-assignment returns 404 rather than 409."""
+        order = Order.objects.create(
+            customer=self.customer,
+            delivery_address='123 Test Street',
+            quantity_kg=25.0,
+            scheduled_time=timezone.now() + timedelta(hours=2)
+        )
+        
+        def delete_order_then_pick_driver(delivery_address):
+            order.delete()
+            return self.driver, self.vehicle
+        
+        url = reverse('orders:assign_driver')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.get_auth_header(self.dispatcher_tokens)
+        )
+        
+        with mock.patch('orders.views.find_nearest_available_driver', side_effect=delete_order_then_pick_driver):
+            response = self.client.post(url, {'order_id': order.id}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
     def test_assign_driver_permission_denied(self):
         """Test driver assignment permission denied for customers."""
         order = Order.objects.create(
@@ -353,6 +489,81 @@ class OrderAPITestCase(APITestCase):
         self.assertEqual(tracking_log.latitude, -1.2921)
         self.assertEqual(tracking_log.longitude, 36.8219)
     
+    def test_get_delivery_tracking_paginated(self):
+        """Test tracking logs are returned newest first, one page at a time."""
+        order = Order.objects.create(
+            customer=self.customer,
+            delivery_address='123 Test Street',
+            quantity_kg=25.0,
+            scheduled_time=timezone.now() + timedelta(hours=2)
+        )
+        
+        delivery = Delivery.objects.create(
+            order=order,
+            driver=self.driver,
+            vehicle=self.vehicle,
+            assigned_by=self.dispatcher
+        )
+        
+        now = timezone.now()
+        logs = [
+            TrackingLog.objects.create(
+                delivery=delivery,
+                latitude=-1.29,
+                longitude=36.82,
+                timestamp=now - timedelta(minutes=i)
+            )
+            for i in range(3)
+        ]
+        
+        url = reverse('orders:get_delivery_tracking', kwargs={'delivery_id': delivery.id})
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.get_auth_header(self.customer_tokens)
+        )
+        
+        response = self.client.get(url, {'limit': 2})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [log['id'] for log in response.data['tracking_logs']],
+            [logs[0].id, logs[1].id]
+        )
+        self.assertIsNotNone(response.data['next'])
+        
+        response = self.client.get(response.data['next'])
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [log['id'] for log in response.data['tracking_logs']],
+            [logs[2].id]
+        )
+        self.assertIsNone(response.data['next'])
+    
+    def test_get_delivery_tracking_invalid_cursor(self):
+        """Test a garbage cursor is reported as not found, not a server error."""
+        order = Order.objects.create(
+            customer=self.customer,
+            delivery_address='123 Test Street',
+            quantity_kg=25.0,
+            scheduled_time=timezone.now() + timedelta(hours=2)
+        )
+        
+        delivery = Delivery.objects.create(
+            order=order,
+            driver=self.driver,
+            vehicle=self.vehicle,
+            assigned_by=self.dispatcher
+        )
+        
+        url = reverse('orders:get_delivery_tracking', kwargs={'delivery_id': delivery.id})
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.get_auth_header(self.customer_tokens)
+        )
+        
+        response = self.client.get(url, {'cursor': 'not-a-cursor'})
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
     def test_invalid_status_transition(self):
         """Test invalid status transition."""
         order = Order.objects.create(
@@ -502,6 +713,17 @@ class VehicleAPITestCase(APITestCase):
         self.assertIn('results', response.data)
         self.assertEqual(len(response.data['results']), 2)
     
+    def test_list_vehicles_invalid_cursor(self):
+        """Test that a malformed pagination cursor returns 404."""
+        url = reverse('orders:list_vehicles')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.get_auth_header(self.dispatcher_tokens)
+        )
+        
+        response = self.client.get(url, {'cursor': 'not-a-cursor'})
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
     def test_assign_driver_to_vehicle_success(self):
         """Test successful driver assignment to vehicle."""
         # Create a vehicle
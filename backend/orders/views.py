@@ -1,32 +1,45 @@
 from rest_framework import status, permissions
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import APIException
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models import Q, F, ExpressionWrapper, FloatField
+from django.db.models import Q, Exists, OuterRef, Subquery
 from django.utils import timezone
-from geopy.distance import geodesic
 import logging
-import math
 
 from .models import Vehicle, DriverAssignment, Order, Delivery, TrackingLog
 from .serializers import (
     VehicleSerializer, VehicleCreateSerializer, VehicleDriverAssignmentSerializer,
     DriverAssignmentSerializer, OrderCreateSerializer,
-    OrderSerializer, OrderStatusUpdateSerializer, DeliverySerializer,
-    DeliveryAssignmentSerializer, TrackingLogSerializer
+    OrderSerializer, OrderListSerializer, OrderStatusUpdateSerializer, DeliverySerializer,
+    DeliveryAssignmentSerializer, TrackingLogSerializer,
+    ORDER_LIST_VALUES, ORDER_LIST_EXPRESSIONS
 )
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Role groups used by the permission classes and in-view checks
+_DISPATCH_ROLES = frozenset({'DISPATCHER', 'ADMIN'})
+_DRIVER_DISPATCH_ROLES = frozenset({'DRIVER', 'DISPATCHER', 'ADMIN'})
 
-class OrderPagination(PageNumberPagination):
-    """Custom pagination for orders."""
+
+class OrderPagination(CursorPagination):
+    """Keyset pagination for orders, newest first."""
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+
+class TrackingLogPagination(CursorPagination):
+    """Keyset pagination for tracking logs, newest first."""
+    page_size = 100
+    page_size_query_param = 'limit'
+    max_page_size = 500
+    ordering = ('-timestamp', '-id')
 
 
 # Custom permission classes
@@ -34,25 +47,55 @@ class IsCustomerOrReadOnly(permissions.BasePermission):
     """Permission to allow customers to create orders, others to read."""
     
     def has_permission(self, request, view):
+        user = request.user
         if request.method in permissions.SAFE_METHODS:
-            return request.user.is_authenticated
-        return request.user.is_authenticated and request.user.role == 'CUSTOMER'
+            return user.is_authenticated
+        return user.is_authenticated and user.role == 'CUSTOMER'
 
 
 class IsDispatcherOrAdmin(permissions.BasePermission):
     """Permission for dispatcher and admin roles only."""
     
     def has_permission(self, request, view):
-        return (request.user.is_authenticated and 
-                request.user.role in ['DISPATCHER', 'ADMIN'])
+        user = request.user
+        return user.is_authenticated and user.role in _DISPATCH_ROLES
 
 
 class IsDriverOrDispatcherOrAdmin(permissions.BasePermission):
     """Permission for driver, dispatcher, and admin roles."""
     
     def has_permission(self, request, view):
-        return (request.user.is_authenticated and 
-                request.user.role in ['DRIVER', 'DISPATCHER', 'ADMIN'])
+        user = request.user
+        return user.is_authenticated and user.role in _DRIVER_DISPATCH_ROLES
+
+
+# Delivery changes triggered by an order status change:
+# new order status -> (required delivery statuses or None, column values)
+_DELIVERY_TRANSITIONS = {
+    'ON_ROUTE': (('ASSIGNED',), lambda: {'status': 'IN_PROGRESS', 'started_at': timezone.now()}),
+    'DELIVERED': (('IN_PROGRESS',), lambda: {'status': 'COMPLETED', 'completed_at': timezone.now()}),
+    'CANCELLED': (None, lambda: {'status': 'FAILED', 'failure_reason': 'Order cancelled'}),
+}
+
+
+def _order_scope(user):
+    """Return a Q object limiting orders to those the user may see."""
+    role = user.role
+    if role == 'CUSTOMER':
+        return Q(customer=user)
+    if role == 'DRIVER':
+        return Q(delivery__driver=user)
+    return Q()
+
+
+def _delivery_scope(user):
+    """Return a Q object limiting deliveries to those the user may see."""
+    role = user.role
+    if role == 'CUSTOMER':
+        return Q(order__customer=user)
+    if role == 'DRIVER':
+        return Q(driver=user)
+    return Q()
 
 
 # ============= ORDER MANAGEMENT VIEWS =============
@@ -75,7 +118,7 @@ def create_order(request):
         if serializer.is_valid():
             order = serializer.save()
             
-            logger.info(f"Order {order.id} created by customer {request.user.username}")
+            logger.info("Order %s created by customer %s", order.id, request.user.username)
             
             # Return created order details
             order_serializer = OrderSerializer(order)
@@ -91,7 +134,7 @@ def create_order(request):
         }, status=status.HTTP_400_BAD_REQUEST)
         
     except Exception as e:
-        logger.error(f"Order creation error: {str(e)}")
+        logger.exception("Order creation error: %s", e)
         return Response({
             'error': 'Internal server error during order creation'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -108,36 +151,29 @@ def list_orders(request):
     - Dispatchers and Admins see all orders
     """
     try:
-        user = request.user
-        
         # Filter orders based on user role
-        if user.role == 'CUSTOMER':
-            orders = Order.objects.filter(customer=user)
-        elif user.role == 'DRIVER':
-            orders = Order.objects.filter(delivery__driver=user)
-        else:  # DISPATCHER or ADMIN
-            orders = Order.objects.all()
+        orders = Order.objects.filter(_order_scope(request.user))
         
         # Apply additional filters from query parameters
         status_filter = request.GET.get('status')
         if status_filter:
             orders = orders.filter(status=status_filter)
         
+        # Fetch plain rows; the list view never needs Order instances
+        orders = orders.values(*ORDER_LIST_VALUES, **ORDER_LIST_EXPRESSIONS)
+        
         # Pagination
         paginator = OrderPagination()
         page = paginator.paginate_queryset(orders, request)
         
-        if page is not None:
-            serializer = OrderSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
-        
-        serializer = OrderSerializer(orders, many=True)
-        return Response({
-            'orders': serializer.data
-        }, status=status.HTTP_200_OK)
+        serializer = OrderListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
         
+    except APIException:
+        # e.g. NotFound for an invalid cursor; let DRF answer it
+        raise
     except Exception as e:
-        logger.error(f"List orders error: {str(e)}")
+        logger.exception("List orders error: %s", e)
         return Response({
             'error': 'Internal server error while fetching orders'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -148,26 +184,19 @@ def list_orders(request):
 def get_order(request, order_id):
     """Get specific order details."""
     try:
-        order = Order.objects.get(id=order_id)
-        
-        # Check permissions
-        user = request.user
-        if user.role == 'CUSTOMER' and order.customer != user:
-            return Response({
-                'error': 'Permission denied'
-            }, status=status.HTTP_403_FORBIDDEN)
-        elif user.role == 'DRIVER':
-            if not hasattr(order, 'delivery') or order.delivery.driver != user:
-                return Response({
-                    'error': 'Permission denied'
-                }, status=status.HTTP_403_FORBIDDEN)
+        # Ownership is enforced in the query; orders the user may not see
+        # are reported as not found
+        order = Order.objects.select_related(
+            'customer', 'delivery__driver', 'delivery__vehicle', 'delivery__assigned_by'
+        ).filter(_order_scope(request.user)).get(id=order_id)
         
         serializer = OrderSerializer(order)
         order_data = serializer.data
         
         # Include delivery information if exists
-        if hasattr(order, 'delivery'):
-            delivery_serializer = DeliverySerializer(order.delivery)
+        delivery = order.get_cached_delivery()
+        if delivery is not None:
+            delivery_serializer = DeliverySerializer(delivery)
             order_data['delivery'] = delivery_serializer.data
         
         return Response({
@@ -179,7 +208,7 @@ def get_order(request, order_id):
             'error': 'Order not found'
         }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        logger.error(f"Get order error: {str(e)}")
+        logger.exception("Get order error: %s", e)
         return Response({
             'error': 'Internal server error while fetching order'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -198,38 +227,30 @@ def find_nearest_available_driver(delivery_address, exclude_driver_ids=None):
     4. Use real-time driver location tracking
     """
     
-    # Get all active drivers with active vehicle assignments
-    current_time = timezone.now()
-    
-    available_drivers = User.objects.filter(
-        role='DRIVER',
-        is_active=True,
-        vehicle_assignments__end_date__isnull=True,
-        vehicle_assignments__vehicle__status='ACTIVE'
-    ).exclude(
-        id__in=exclude_driver_ids or []
-    ).distinct()
-    
-    # Filter out drivers who are currently on active deliveries
-    available_drivers = available_drivers.exclude(
-        deliveries__status__in=['ASSIGNED', 'IN_PROGRESS']
+    # Drivers already on an active delivery are not available
+    busy = Delivery.objects.filter(
+        driver=OuterRef('driver'),
+        status__in=['ASSIGNED', 'IN_PROGRESS']
     )
     
-    if not available_drivers.exists():
-        return None, None
-    
-    # For demo purposes, return the first available driver
-    # In production, implement proper distance calculation
-    driver = available_drivers.first()
-    
-    # Get the driver's current vehicle
-    current_assignment = DriverAssignment.objects.filter(
-        driver=driver,
+    # Resolve driver and vehicle from the open assignment in one query
+    assignment = DriverAssignment.objects.select_related('driver', 'vehicle').filter(
+        driver__role='DRIVER',
+        driver__is_active=True,
         end_date__isnull=True,
         vehicle__status='ACTIVE'
+    ).exclude(
+        driver_id__in=exclude_driver_ids or []
+    ).exclude(
+        Exists(busy)
     ).first()
     
-    return driver, current_assignment.vehicle if current_assignment else None
+    # For demo purposes, return the first available driver
+    # In production, implement proper distance calculation
+    if assignment is None:
+        return None, None
+    
+    return assignment.driver, assignment.vehicle
 
 
 @api_view(['POST'])
@@ -254,35 +275,55 @@ def assign_driver(request):
         driver_id = validated_data.get('driver_id')
         vehicle_id = validated_data.get('vehicle_id')
         
-        with transaction.atomic():
-            order = Order.objects.select_for_update().get(id=order_id)
+        # Resolve driver and vehicle before taking the order row lock so
+        # the lookups don't extend the critical section
+        if not driver_id:
+            delivery_address = Order.objects.only('delivery_address').get(id=order_id).delivery_address
+            driver, vehicle = find_nearest_available_driver(delivery_address)
+            
+            if not driver:
+                return Response({
+                    'error': 'No available drivers found'
+                }, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            # Fetch the driver together with their current vehicle assignment
+            current_vehicle = DriverAssignment.objects.filter(
+                driver=OuterRef('pk'),
+                end_date__isnull=True,
+                vehicle__status='ACTIVE'
+            ).values('vehicle_id')[:1]
+            driver = User.objects.annotate(
+                active_vehicle_id=Subquery(current_vehicle)
+            ).get(id=driver_id)
             
-            # If specific driver/vehicle not provided, find nearest available
-            if not driver_id:
-                driver, vehicle = find_nearest_available_driver(order.delivery_address)
+            if not vehicle_id:
+                vehicle_id = driver.active_vehicle_id
                 
-                if not driver:
+                if not vehicle_id:
                     return Response({
-                        'error': 'No available drivers found'
+                        'error': 'Driver has no active vehicle assignment'
                     }, status=status.HTTP_400_BAD_REQUEST)
-            else:
-                driver = User.objects.get(id=driver_id)
-                if vehicle_id:
-                    vehicle = Vehicle.objects.get(id=vehicle_id)
-                else:
-                    # Find driver's current vehicle assignment
-                    current_assignment = DriverAssignment.objects.filter(
-                        driver=driver,
-                        end_date__isnull=True,
-                        vehicle__status='ACTIVE'
-                    ).first()
-                    
-                    if not current_assignment:
-                        return Response({
-                            'error': 'Driver has no active vehicle assignment'
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    vehicle = current_assignment.vehicle
+            
+            vehicle = Vehicle.objects.get(id=vehicle_id)
+        
+        with transaction.atomic():
+            # Fail fast instead of queueing behind another dispatcher's lock
+            order = Order.objects.select_for_update(of=('self',), skip_locked=True).filter(id=order_id).first()
+            
+            if order is None:
+                # skip_locked also yields None for a missing order; only a locked one is a conflict
+                if not Order.objects.filter(id=order_id).exists():
+                    raise Order.DoesNotExist
+                
+                return Response({
+                    'error': 'Order is being assigned by another request'
+                }, status=status.HTTP_409_CONFLICT)
+            
+            # Re-check under the lock in case another dispatcher got here first
+            if order.status != 'PENDING':
+                return Response({
+                    'error': 'Only pending orders can be assigned'
+                }, status=status.HTTP_400_BAD_REQUEST)
             
             # Create delivery record
             delivery = Delivery.objects.create(
@@ -294,17 +335,16 @@ def assign_driver(request):
             )
             
             # Update order status
-            order.status = 'ASSIGNED'
-            order.save()
-            
-            logger.info(f"Order {order.id} assigned to driver {driver.username} by {request.user.username}")
-            
-            delivery_serializer = DeliverySerializer(delivery)
-            
-            return Response({
-                'message': 'Driver assigned successfully',
-                'delivery': delivery_serializer.data
-            }, status=status.HTTP_201_CREATED)
+            Order.objects.filter(id=order.id).update(status='ASSIGNED', updated_at=timezone.now())
+        
+        logger.info("Order %s assigned to driver %s by %s", order.id, driver.username, request.user.username)
+        
+        delivery_serializer = DeliverySerializer(delivery)
+        
+        return Response({
+            'message': 'Driver assigned successfully',
+            'delivery': delivery_serializer.data
+        }, status=status.HTTP_201_CREATED)
         
     except Order.DoesNotExist:
         return Response({
@@ -319,7 +359,7 @@ def assign_driver(request):
             'error': 'Vehicle not found'
         }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        logger.error(f"Driver assignment error: {str(e)}")
+        logger.exception("Driver assignment error: %s", e)
         return Response({
             'error': 'Internal server error during driver assignment'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -337,11 +377,13 @@ def update_order_status(request, order_id):
     - Dispatchers and Admins can update any order status
     """
     try:
-        order = Order.objects.get(id=order_id)
+        order = Order.objects.select_related('delivery').get(id=order_id)
+        delivery = order.get_cached_delivery()
         
         # Check permissions for drivers
-        if request.user.role == 'DRIVER':
-            if not hasattr(order, 'delivery') or order.delivery.driver != request.user:
+        user = request.user
+        if user.role == 'DRIVER':
+            if delivery is None or delivery.driver_id != user.id:
                 return Response({
                     'error': 'Permission denied - order not assigned to you'
                 }, status=status.HTTP_403_FORBIDDEN)
@@ -353,27 +395,20 @@ def update_order_status(request, order_id):
                 new_status = serializer.validated_data['status']
                 old_status = order.status
                 
-                # Update order
-                order = serializer.save()
+                # Update order, writing only the changed columns
+                order.status = new_status
+                order.save(update_fields=['status', 'updated_at'])
                 
-                # Update delivery status if exists
-                if hasattr(order, 'delivery'):
-                    delivery = order.delivery
-                    
-                    if new_status == 'ON_ROUTE' and delivery.status == 'ASSIGNED':
-                        delivery.status = 'IN_PROGRESS'
-                        delivery.started_at = timezone.now()
-                        delivery.save()
-                    elif new_status == 'DELIVERED' and delivery.status == 'IN_PROGRESS':
-                        delivery.status = 'COMPLETED'
-                        delivery.completed_at = timezone.now()
-                        delivery.save()
-                    elif new_status == 'CANCELLED':
-                        delivery.status = 'FAILED'
-                        delivery.failure_reason = 'Order cancelled'
-                        delivery.save()
+                # Update delivery status if exists, guarded on its current
+                # status so a concurrent update can't be overwritten
+                if delivery is not None and new_status in _DELIVERY_TRANSITIONS:
+                    from_statuses, changes = _DELIVERY_TRANSITIONS[new_status]
+                    deliveries = Delivery.objects.filter(pk=delivery.pk)
+                    if from_statuses:
+                        deliveries = deliveries.filter(status__in=from_statuses)
+                    deliveries.update(**changes())
                 
-                logger.info(f"Order {order.id} status updated from {old_status} to {new_status} by {request.user.username}")
+                logger.info("Order %s status updated from %s to %s by %s", order.id, old_status, new_status, request.user.username)
                 
                 order_serializer = OrderSerializer(order)
                 
@@ -392,7 +427,7 @@ def update_order_status(request, order_id):
             'error': 'Order not found'
         }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        logger.error(f"Status update error: {str(e)}")
+        logger.exception("Status update error: %s", e)
         return Response({
             'error': 'Internal server error during status update'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -417,10 +452,12 @@ def add_tracking_log(request):
                 'error': 'Delivery ID is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        delivery = Delivery.objects.get(id=delivery_id)
+        # Only the driver id is needed for the permission check
+        delivery = Delivery.objects.only('id', 'driver_id').get(id=delivery_id)
         
         # Check permissions for drivers
-        if request.user.role == 'DRIVER' and delivery.driver != request.user:
+        user = request.user
+        if user.role == 'DRIVER' and delivery.driver_id != user.id:
             return Response({
                 'error': 'Permission denied - delivery not assigned to you'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -445,7 +482,7 @@ def add_tracking_log(request):
             'error': 'Delivery not found'
         }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        logger.error(f"Tracking log error: {str(e)}")
+        logger.exception("Tracking log error: %s", e)
         return Response({
             'error': 'Internal server error while adding tracking log'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -460,34 +497,35 @@ def get_delivery_tracking(request, delivery_id):
     Customers can track their orders, drivers can see their delivery tracking.
     """
     try:
-        delivery = Delivery.objects.get(id=delivery_id)
+        # Ownership is enforced in the query; deliveries the user may not
+        # see are reported as not found
+        delivery = Delivery.objects.filter(_delivery_scope(request.user)).get(id=delivery_id)
         
-        # Check permissions
-        user = request.user
-        if user.role == 'CUSTOMER' and delivery.order.customer != user:
-            return Response({
-                'error': 'Permission denied'
-            }, status=status.HTTP_403_FORBIDDEN)
-        elif user.role == 'DRIVER' and delivery.driver != user:
-            return Response({
-                'error': 'Permission denied'
-            }, status=status.HTTP_403_FORBIDDEN)
+        # Seek on the (delivery, -timestamp) index instead of returning the
+        # whole history on every poll
+        tracking_logs = TrackingLog.objects.filter(delivery=delivery)
         
-        tracking_logs = TrackingLog.objects.filter(delivery=delivery).order_by('-timestamp')
+        paginator = TrackingLogPagination()
+        page = paginator.paginate_queryset(tracking_logs, request)
         
-        serializer = TrackingLogSerializer(tracking_logs, many=True)
+        serializer = TrackingLogSerializer(page, many=True)
         
         return Response({
             'delivery_id': delivery_id,
-            'tracking_logs': serializer.data
+            'tracking_logs': serializer.data,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link()
         }, status=status.HTTP_200_OK)
         
     except Delivery.DoesNotExist:
         return Response({
             'error': 'Delivery not found'
         }, status=status.HTTP_404_NOT_FOUND)
+    except APIException:
+        # e.g. NotFound for an invalid cursor; let DRF answer it
+        raise
     except Exception as e:
-        logger.error(f"Get tracking error: {str(e)}")
+        logger.exception("Get tracking error: %s", e)
         return Response({
             'error': 'Internal server error while fetching tracking data'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -509,7 +547,7 @@ def create_vehicle(request):
         if serializer.is_valid():
             vehicle = serializer.save()
             
-            logger.info(f"Vehicle {vehicle.plate_number} created by {request.user.username}")
+            logger.info("Vehicle %s created by %s", vehicle.plate_number, request.user.username)
             
             # Return created vehicle details
             vehicle_serializer = VehicleSerializer(vehicle)
@@ -525,7 +563,7 @@ def create_vehicle(request):
         }, status=status.HTTP_400_BAD_REQUEST)
         
     except Exception as e:
-        logger.error(f"Vehicle creation error: {str(e)}")
+        logger.exception("Vehicle creation error: %s", e)
         return Response({
             'error': 'Internal server error during vehicle creation'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -555,17 +593,14 @@ def list_vehicles(request):
         paginator = OrderPagination()
         page = paginator.paginate_queryset(vehicles, request)
         
-        if page is not None:
-            serializer = VehicleSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
-        
-        serializer = VehicleSerializer(vehicles, many=True)
-        return Response({
-            'vehicles': serializer.data
-        }, status=status.HTTP_200_OK)
+        serializer = VehicleSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
         
+    except APIException:
+        # e.g. NotFound for an invalid cursor; let DRF answer it
+        raise
     except Exception as e:
-        logger.error(f"List vehicles error: {str(e)}")
+        logger.exception("List vehicles error: %s", e)
         return Response({
             'error': 'Internal server error while fetching vehicles'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -589,7 +624,7 @@ def get_vehicle(request, vehicle_id):
             'error': 'Vehicle not found'
         }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        logger.error(f"Get vehicle error: {str(e)}")
+        logger.exception("Get vehicle error: %s", e)
         return Response({
             'error': 'Internal server error while fetching vehicle'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -611,7 +646,7 @@ def update_vehicle(request, vehicle_id):
         if serializer.is_valid():
             vehicle = serializer.save()
             
-            logger.info(f"Vehicle {vehicle.plate_number} updated by {request.user.username}")
+            logger.info("Vehicle %s updated by %s", vehicle.plate_number, request.user.username)
             
             vehicle_serializer = VehicleSerializer(vehicle)
             
@@ -630,7 +665,7 @@ def update_vehicle(request, vehicle_id):
             'error': 'Vehicle not found'
         }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        logger.error(f"Vehicle update error: {str(e)}")
+        logger.exception("Vehicle update error: %s", e)
         return Response({
             'error': 'Internal server error during vehicle update'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -664,33 +699,30 @@ def assign_driver_to_vehicle(request):
             if driver_id is None:
                 old_driver = vehicle.driver
                 vehicle.driver = None
-                vehicle.save()
+                vehicle.save(update_fields=['driver', 'updated_at'])
                 
                 message = f"Driver unassigned from vehicle {vehicle.plate_number}"
                 if old_driver:
-                    logger.info(f"Driver {old_driver.username} unassigned from vehicle {vehicle.plate_number} by {request.user.username}")
+                    logger.info("Driver %s unassigned from vehicle %s by %s", old_driver.username, vehicle.plate_number, request.user.username)
                 else:
-                    logger.info(f"Vehicle {vehicle.plate_number} had no assigned driver")
+                    logger.info("Vehicle %s had no assigned driver", vehicle.plate_number)
             else:
                 # Assign new driver
                 driver = User.objects.get(id=driver_id)
                 
-                # Unassign driver from any previous vehicle
-                try:
-                    old_vehicle = Vehicle.objects.get(driver=driver)
-                    old_vehicle.driver = None
-                    old_vehicle.save()
-                    logger.info(f"Driver {driver.username} reassigned from vehicle {old_vehicle.plate_number} to {vehicle.plate_number}")
-                except Vehicle.DoesNotExist:
-                    # Driver was not assigned to any vehicle
-                    pass
+                # Unassign driver from any previous vehicle in a single UPDATE
+                unassigned = Vehicle.objects.filter(driver=driver).exclude(pk=vehicle.pk).update(
+                    driver=None, updated_at=timezone.now()
+                )
+                if unassigned:
+                    logger.info("Driver %s reassigned from previous vehicle to %s", driver.username, vehicle.plate_number)
                 
                 # Assign to new vehicle
                 vehicle.driver = driver
-                vehicle.save()
+                vehicle.save(update_fields=['driver', 'updated_at'])
                 
                 message = f"Driver {driver.username} assigned to vehicle {vehicle.plate_number}"
-                logger.info(f"Driver {driver.username} assigned to vehicle {vehicle.plate_number} by {request.user.username}")
+                logger.info("Driver %s assigned to vehicle %s by %s", driver.username, vehicle.plate_number, request.user.username)
             
             # Return updated vehicle details
             vehicle_serializer = VehicleSerializer(vehicle)
@@ -709,7 +741,7 @@ def assign_driver_to_vehicle(request):
             'error': 'Driver not found'
         }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        logger.error(f"Driver-vehicle assignment error: {str(e)}")
+        logger.exception("Driver-vehicle assignment error: %s", e)
         return Response({
             'error': 'Internal server error during driver-vehicle assignment'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
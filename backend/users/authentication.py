@@ -1,7 +1,10 @@
 import jwt
+import hashlib
+import time
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from .jwt_service import JWTService
 import logging
 
@@ -19,6 +22,24 @@ class JWTAuthentication(BaseAuthentication):
     """
     
     authentication_header_prefix = 'Bearer'
+    _prefix_with_space = authentication_header_prefix.lower() + ' '
+    
+    # How long a verified token -> user id mapping is trusted, in seconds
+    verified_token_cache_timeout = 30
+    
+    @staticmethod
+    def get_token_cache_key(token):
+        """
+        Build the cache key under which a verified access token is stored.
+        
+        Args:
+            token (str): JWT token
+            
+        Returns:
+            str: Cache key
+        """
+        digest = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+        return f"jwt:verified:{digest}"
     
     def authenticate(self, request):
         """
@@ -49,7 +70,7 @@ class JWTAuthentication(BaseAuthentication):
         except AuthenticationFailed:
             raise
         except Exception as e:
-            logger.error(f"JWT authentication error: {str(e)}")
+            logger.error("JWT authentication error: %s", e)
             raise AuthenticationFailed('Authentication failed due to server error')
     
     def get_authorization_header(self, request):
@@ -81,21 +102,31 @@ class JWTAuthentication(BaseAuthentication):
         Raises:
             AuthenticationFailed: If header format is invalid
         """
-        auth_parts = auth_header.split()
-        
-        if len(auth_parts) != 2:
-            raise AuthenticationFailed('Invalid authorization header format')
-        
-        auth_type, token = auth_parts
+        prefix_length = len(self._prefix_with_space)
         
-        if auth_type.lower() != self.authentication_header_prefix.lower():
+        if auth_header[:prefix_length].lower() != self._prefix_with_space:
             return None  # Not a Bearer token, let other authenticators try
         
+        token = auth_header[prefix_length:].strip()
+        
         if not token:
             raise AuthenticationFailed('No token provided')
         
+        if ' ' in token:
+            raise AuthenticationFailed('Invalid authorization header format')
+        
         return token
     
+    @classmethod
+    def forget_token(cls, token):
+        """
+        Drop a token from the verified-token cache so its next use is re-checked.
+        
+        Args:
+            token (str): JWT token
+        """
+        cache.delete(cls.get_token_cache_key(token))
+    
     def authenticate_credentials(self, token):
         """
         Authenticate the user using the JWT token.
@@ -110,7 +141,25 @@ class JWTAuthentication(BaseAuthentication):
             AuthenticationFailed: If authentication fails
         """
         try:
-            user = JWTService.get_user_from_token(token, token_type='access')
+            cache_key = self.get_token_cache_key(token)
+            user_id = cache.get(cache_key)
+            
+            if user_id is not None:
+                # Signature and expiry were checked when the entry was cached
+                user = JWTService.get_user_from_payload({'user_id': user_id})
+            else:
+                payload = JWTService.verify_token(token, token_type='access')
+                
+                # Only checked on a miss; signout evicts the cached entry via forget_token()
+                if JWTService.is_blacklisted(payload.get('jti')):
+                    raise jwt.InvalidTokenError('Token has been revoked')
+                
+                user = JWTService.get_user_from_payload(payload)
+                
+                # Never trust the cached entry beyond the token's own expiry
+                timeout = min(self.verified_token_cache_timeout, int(payload['exp'] - time.time()))
+                if user and timeout > 0:
+                    cache.set(cache_key, user.id, timeout=timeout)
             
             if not user:
                 raise AuthenticationFailed('Invalid token: user not found')
@@ -125,7 +174,7 @@ class JWTAuthentication(BaseAuthentication):
         except jwt.InvalidTokenError:
             raise AuthenticationFailed('Invalid token')
         except Exception as e:
-            logger.error(f"Token authentication error: {str(e)}")
+            logger.error("Token authentication error: %s", e)
             raise AuthenticationFailed('Authentication failed')
     
     def authenticate_header(self, request):
@@ -139,10 +188,3 @@ class JWTAuthentication(BaseAuthentication):
         """
         return self.authentication_header_prefix
 
-
-class CsrfExemptSessionAuthentication:
-    """
-    Deprecated: Keeping for backward compatibility but not used with JWT.
-    JWT authentication doesn't require CSRF protection as tokens are stateless.
-    """
-    pass
\ No newline at end of file
@@ -0,0 +1,34 @@
+import logging
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import exception_handler, set_rollback
+
+logger = logging.getLogger(__name__)
+
+
+def logging_exception_handler(exc, context):
+    """
+    DRF exception handler that turns unexpected errors into a logged 500.
+    
+    API exceptions (validation, authentication, permissions) keep DRF's
+    default handling. Anything else is logged with its traceback and
+    answered with an {'error': ...} body like the views' own error responses.
+    
+    Args:
+        exc (Exception): The raised exception
+        context (dict): DRF context including the view and request
+        
+    Returns:
+        Response: Error response
+    """
+    response = exception_handler(exc, context)
+    if response is not None:
+        return response
+    
+    view = context.get('view')
+    logger.exception("Unhandled error in %s: %s", type(view).__name__, exc)
+    set_rollback()
+    return Response({
+        'error': 'Internal server error'
+    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
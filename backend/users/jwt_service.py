@@ -1,13 +1,61 @@
 import jwt
-from datetime import datetime, timedelta
+import base64
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from datetime import timedelta
+from functools import lru_cache
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 import logging
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(obj):
+    """Serialize a JWT segment to compact JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _b64url_encode(data):
+    """Base64url-encode bytes without padding, as used in JWT segments."""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+# The HS256 header never changes, so encode it once
+_HEADER_B64 = _b64url_encode(b'{"alg":"HS256","typ":"JWT"}')
+
+
+@lru_cache(maxsize=4096)
+def _decode_verified(token, secret_key, algorithm, time_bucket):
+    """
+    Verify and decode a token, memoized per (token, time bucket).
+    
+    time_bucket only takes part in the cache key so entries are retired as
+    the clock moves on; callers must still check 'exp' on the result.
+    """
+    payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+    
+    # One truthiness check instead of PyJWT's per-claim 'require' loop
+    if not (payload.get('exp') and payload.get('iat') and payload.get('user_id')):
+        raise jwt.InvalidTokenError('Token is missing required claims')
+    
+    return payload
+
+
 class JWTService:
     """
     Senior-level JWT service for token generation, verification, and management.
@@ -20,6 +68,11 @@ class JWTService:
     ALGORITHM = 'HS256'
     ACCESS_TOKEN_LIFETIME = timedelta(hours=24)  # 24 hours
     REFRESH_TOKEN_LIFETIME = timedelta(days=7)   # 7 days
+    DECODE_CACHE_BUCKET_SECONDS = 10  # How long a verified decode is reused
+    USER_CACHE_TIMEOUT = 60  # How long an active user row is served from the cache
+    
+    # Resolved secret key bytes; reset when the settings change
+    _secret_key_cache = None
     
     @classmethod
     def _get_secret_key(cls):
@@ -27,7 +80,46 @@ class JWTService:
         Get the secret key for JWT encoding/decoding.
         In production, this should be a strong, randomly generated key.
         """
-        return getattr(settings, 'JWT_SECRET_KEY', settings.SECRET_KEY)
+        if cls._secret_key_cache is None:
+            cls._secret_key_cache = getattr(settings, 'JWT_SECRET_KEY', settings.SECRET_KEY).encode()
+        return cls._secret_key_cache
+    
+    @classmethod
+    def _sign_hs256(cls, signing_input):
+        """
+        Sign a JWT signing input with HMAC-SHA256.
+        
+        Args:
+            signing_input (bytes): base64url(header) + b'.' + base64url(payload)
+            
+        Returns:
+            bytes: base64url-encoded signature
+        """
+        digest = hmac.new(cls._get_secret_key(), signing_input, hashlib.sha256).digest()
+        return _b64url_encode(digest)
+    
+    @classmethod
+    def _encode(cls, payload):
+        """
+        Encode and sign a payload as a compact JWT.
+        
+        HS256 tokens are assembled and signed directly with hmac, skipping
+        PyJWT's per-call option handling; other algorithms go through PyJWT.
+        
+        Args:
+            payload (dict): Token claims
+            
+        Returns:
+            str: JWT token
+        """
+        if cls.ALGORITHM != 'HS256':
+            return jwt.encode(payload, cls._get_secret_key(), algorithm=cls.ALGORITHM)
+        
+        signing_input = (
+            _HEADER_B64 + b'.' +
+            _b64url_encode(_json_dumps(payload))
+        )
+        return (signing_input + b'.' + cls._sign_hs256(signing_input)).decode()
     
     @classmethod
     def generate_access_token(cls, user):
@@ -41,23 +133,24 @@ class JWTService:
             str: JWT access token
         """
         try:
+            now = int(time.time())
             payload = {
                 'user_id': user.id,
                 'email': user.email,
                 'username': user.username,
                 'role': user.role,
                 'token_type': 'access',
-                'exp': datetime.utcnow() + cls.ACCESS_TOKEN_LIFETIME,
-                'iat': datetime.utcnow(),
-                'jti': f"access_{user.id}_{int(datetime.utcnow().timestamp())}"  # JWT ID for tracking
+                'exp': now + int(cls.ACCESS_TOKEN_LIFETIME.total_seconds()),
+                'iat': now,
+                'jti': uuid.uuid4().hex  # Unique JWT ID, also the blacklist key
             }
             
-            token = jwt.encode(payload, cls._get_secret_key(), algorithm=cls.ALGORITHM)
-            logger.info(f"Access token generated for user: {user.email}")
+            token = cls._encode(payload)
+            logger.debug("Access token generated for user: %s", user.email)
             return token
             
         except Exception as e:
-            logger.error(f"Error generating access token for user {user.email}: {str(e)}")
+            logger.error("Error generating access token for user %s: %s", user.email, e)
             raise
     
     @classmethod
@@ -72,21 +165,22 @@ class JWTService:
             str: JWT refresh token
         """
         try:
+            now = int(time.time())
             payload = {
                 'user_id': user.id,
                 'email': user.email,
                 'token_type': 'refresh',
-                'exp': datetime.utcnow() + cls.REFRESH_TOKEN_LIFETIME,
-                'iat': datetime.utcnow(),
-                'jti': f"refresh_{user.id}_{int(datetime.utcnow().timestamp())}"
+                'exp': now + int(cls.REFRESH_TOKEN_LIFETIME.total_seconds()),
+                'iat': now,
+                'jti': uuid.uuid4().hex
             }
             
-            token = jwt.encode(payload, cls._get_secret_key(), algorithm=cls.ALGORITHM)
-            logger.info(f"Refresh token generated for user: {user.email}")
+            token = cls._encode(payload)
+            logger.debug("Refresh token generated for user: %s", user.email)
             return token
             
         except Exception as e:
-            logger.error(f"Error generating refresh token for user {user.email}: {str(e)}")
+            logger.error("Error generating refresh token for user %s: %s", user.email, e)
             raise
     
     @classmethod
@@ -125,12 +219,21 @@ class JWTService:
             ValueError: Token type mismatch
         """
         try:
-            payload = jwt.decode(
-                token, 
-                cls._get_secret_key(), 
-                algorithms=[cls.ALGORITHM],
-                options={'require': ['exp', 'iat', 'user_id']}
-            )
+            # The memoized decode hashes its arguments; reject non-strings (e.g. JSON lists) up front
+            if not isinstance(token, str):
+                raise jwt.InvalidTokenError('Token must be a string')
+            
+            now = time.time()
+            payload = dict(_decode_verified(
+                token,
+                cls._get_secret_key(),
+                cls.ALGORITHM,
+                int(now) // cls.DECODE_CACHE_BUCKET_SECONDS
+            ))
+            
+            # A memoized payload can outlive the token by up to one bucket
+            if payload['exp'] <= now:
+                raise jwt.ExpiredSignatureError('Signature has expired')
             
             # Verify token type
             if payload.get('token_type') != token_type:
@@ -139,13 +242,13 @@ class JWTService:
             return payload
             
         except jwt.ExpiredSignatureError:
-            logger.warning(f"Expired {token_type} token used")
+            logger.warning("Expired %s token used", token_type)
             raise
         except jwt.InvalidTokenError as e:
-            logger.warning(f"Invalid {token_type} token: {str(e)}")
+            logger.warning("Invalid %s token: %s", token_type, e)
             raise
         except Exception as e:
-            logger.error(f"Error verifying {token_type} token: {str(e)}")
+            logger.error("Error verifying %s token: %s", token_type, e)
             raise
     
     @classmethod
@@ -166,26 +269,67 @@ class JWTService:
         """
         try:
             payload = cls.verify_token(token, token_type)
-            user_id = payload.get('user_id')
-            
-            if not user_id:
-                logger.warning("Token payload missing user_id")
-                return None
-            
-            try:
-                user = User.objects.get(id=user_id, is_active=True)
-                return user
-            except User.DoesNotExist:
-                logger.warning(f"User {user_id} not found or inactive")
-                return None
+            return cls.get_user_from_payload(payload)
                 
         except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
             # Re-raise JWT errors for proper handling upstream
             raise
         except Exception as e:
-            logger.error(f"Error extracting user from token: {str(e)}")
+            logger.error("Error extracting user from token: %s", e)
             return None
     
+    @classmethod
+    def get_user_from_payload(cls, payload):
+        """
+        Return the active user referenced by an already verified payload.
+        
+        Args:
+            payload (dict): Decoded token payload
+            
+        Returns:
+            User: User instance or None if not found
+        """
+        user_id = payload.get('user_id')
+        
+        if not user_id:
+            logger.warning("Token payload missing user_id")
+            return None
+        
+        user = cls._get_cached_user(user_id)
+        if user is None:
+            logger.warning("User %s not found or inactive", user_id)
+        return user
+    
+    @staticmethod
+    def get_user_cache_key(user_id):
+        """Build the cache key under which an active user is stored."""
+        return f"jwt:user:{user_id}"
+    
+    @classmethod
+    def _get_cached_user(cls, user_id):
+        """
+        Return the active user with the given id, served from the cache when possible.
+        
+        Entries are dropped whenever the user is saved or deleted, so the TTL
+        only bounds staleness after bulk queryset updates. The password hash
+        is deferred so it never lands in a (possibly shared) cache.
+        
+        Args:
+            user_id: Primary key of the user
+            
+        Returns:
+            User: User instance or None if not found or inactive
+        """
+        cache_key = cls.get_user_cache_key(user_id)
+        user = cache.get(cache_key)
+        if user is None:
+            try:
+                user = User.objects.defer('password').get(id=user_id, is_active=True)
+            except User.DoesNotExist:
+                return None
+            cache.set(cache_key, user, timeout=cls.USER_CACHE_TIMEOUT)
+        return user
+    
     @classmethod
     def refresh_access_token(cls, refresh_token):
         """
@@ -201,7 +345,16 @@ class JWTService:
             jwt.ExpiredSignatureError: Refresh token has expired
             jwt.InvalidTokenError: Refresh token is invalid
         """
-        user = cls.get_user_from_token(refresh_token, token_type='refresh')
+        try:
+            payload = cls.verify_token(refresh_token, 'refresh')
+        except ValueError:
+            # An access token was sent where a refresh token belongs
+            raise jwt.InvalidTokenError("Invalid refresh token")
+        
+        if cls.is_blacklisted(payload.get('jti')):
+            raise jwt.InvalidTokenError("Refresh token has been revoked")
+        
+        user = cls.get_user_from_payload(payload)
         
         if not user:
             raise jwt.InvalidTokenError("Invalid refresh token")
@@ -213,6 +366,9 @@ class JWTService:
         """
         Check if a token is expired without raising an exception.
         
+        Only the payload segment is decoded; the signature is not checked,
+        so this must not be used to decide whether a token is trustworthy.
+        
         Args:
             token (str): JWT token to check
             
@@ -220,34 +376,70 @@ class JWTService:
             bool: True if expired, False if valid, None if invalid format
         """
         try:
-            payload = jwt.decode(
-                token, 
-                cls._get_secret_key(), 
-                algorithms=[cls.ALGORITHM],
-                options={'verify_exp': False}  # Don't verify expiration
-            )
+            segment = token.split('.')[1]
+            payload = json.loads(base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4)))
             
             exp = payload.get('exp')
             if exp:
-                return datetime.utcnow() > datetime.fromtimestamp(exp)
+                return exp <= time.time()
             return None
             
-        except jwt.InvalidTokenError:
+        except (AttributeError, IndexError, TypeError, ValueError):
             return None
     
+    @staticmethod
+    def get_blacklist_cache_key(jti):
+        """Build the cache key marking a token ID as revoked."""
+        return f"jwt:blacklist:{jti}"
+    
     @classmethod
     def blacklist_token(cls, token):
         """
         Add token to blacklist (for logout functionality).
         
-        Note: In a production environment, you might want to store
-        blacklisted tokens in Redis or a database table.
-        For now, this is a placeholder for the implementation.
+        Only the token's jti is stored, and only for as long as the token
+        itself would remain valid. The blacklist is consulted when a refresh
+        token is exchanged and whenever an access token is verified afresh
+        by JWTAuthentication.
         
         Args:
             token (str): Token to blacklist
         """
-        # TODO: Implement token blacklisting in production
-        # This could be done using Redis or a database table
-        logger.info(f"Token blacklisted (placeholder implementation)")
-        pass
\ No newline at end of file
+        try:
+            payload = jwt.decode(
+                token,
+                cls._get_secret_key(),
+                algorithms=[cls.ALGORITHM],
+                options={'verify_exp': False}
+            )
+        except jwt.InvalidTokenError as e:
+            logger.warning("Refusing to blacklist invalid token: %s", e)
+            return
+        
+        jti = payload.get('jti')
+        timeout = int(payload.get('exp', 0)) - int(time.time())
+        
+        if jti and timeout > 0:
+            cache.set(cls.get_blacklist_cache_key(jti), True, timeout=timeout)
+            logger.info("Token blacklisted: %s", jti)
+    
+    @classmethod
+    def is_blacklisted(cls, jti):
+        """
+        Check whether a token ID has been revoked.
+        
+        Args:
+            jti (str): JWT ID claim of the token
+            
+        Returns:
+            bool: True if the token was blacklisted
+        """
+        return bool(jti) and cache.get(cls.get_blacklist_cache_key(jti), False)
+
+
+@receiver(setting_changed)
+def _reset_secret_key_cache(setting, **kwargs):
+    """Drop the cached secret key and decoded payloads when the signing settings change."""
+    if setting in ('JWT_SECRET_KEY', 'SECRET_KEY'):
+        JWTService._secret_key_cache = None
+        _decode_verified.cache_clear()
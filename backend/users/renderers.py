@@ -0,0 +1,40 @@
+import orjson
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+# DRF's own handling for everything orjson passes through (datetimes, Decimals, lazy strings)
+_drf_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson.
+    
+    Datetimes and types orjson doesn't support natively are handed to DRF's
+    encoder, and U+2028/U+2029 are escaped. Indented output (e.g.
+    'application/json; indent=4') and data orjson refuses to encode (such
+    as integers beyond 64 bits) are left to JSONRenderer.
+    
+    Output otherwise matches DRF's compact JSON except for floats: orjson
+    writes exponents without a sign (1e16 rather than 1e+16) and renders
+    NaN and infinity as null, where JSONRenderer raises ValueError.
+    """
+    
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if data is None:
+            return b''
+        
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        try:
+            ret = orjson.dumps(data, default=_drf_default, option=self.options)
+        except TypeError:  # orjson.JSONEncodeError
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -1,10 +1,42 @@
 from rest_framework import serializers
-from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.db.models import Q
+from django.utils import timezone
 from .models import User
 
 
+def _unique_violation_field(error):
+    """
+    Return the User field whose unique constraint an IntegrityError reports.
+    
+    Matches the constraint/column name as backends print it: 'users.email'
+    (SQLite, MySQL) or 'users_email_key' (PostgreSQL). Only the first line
+    is searched, since PostgreSQL's DETAIL line echoes the duplicate value.
+    
+    Args:
+        error (IntegrityError): Error raised by the INSERT
+        
+    Returns:
+        str: 'email' or 'username', or None if neither constraint matched
+    """
+    message = str(error).split('\n', 1)[0]
+    table = User._meta.db_table
+    
+    # MySQL puts the duplicate value before the key name, so take the last match
+    positions = {}
+    for name in ('email', 'username'):
+        column = User._meta.get_field(name).column
+        positions[name] = max(
+            message.rfind(f'{table}.{column}'),
+            message.rfind(f'{table}_{column}_key'),
+        )
+    
+    field = max(positions, key=positions.get)
+    return field if positions[field] >= 0 else None
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration."""
     
@@ -24,23 +56,12 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             'username', 'email', 'password', 'password_confirm',
             'role', 'phone_number', 'address'
         )
+        # Uniqueness is checked once for both fields in validate()
         extra_kwargs = {
-            'email': {'required': True},
-            'username': {'required': True},
+            'email': {'required': True, 'validators': []},
+            'username': {'required': True, 'validators': []},
         }
     
-    def validate_email(self, value):
-        """Validate that email is unique."""
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
-    
-    def validate_username(self, value):
-        """Validate that username is unique."""
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError("A user with this username already exists.")
-        return value
-    
     def validate_password(self, value):
         """Validate password using Django's built-in validators."""
         try:
@@ -50,7 +71,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return value
     
     def validate(self, attrs):
-        """Validate that passwords match."""
+        """Validate that passwords match and that email and username are unique."""
         password = attrs.get('password')
         password_confirm = attrs.pop('password_confirm', None)
         
@@ -58,11 +79,40 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({
                 'password_confirm': 'Passwords do not match.'
             })
+        
+        email = attrs['email']
+        username = attrs['username']
+        
+        # One query covers both fields; email is compared case-insensitively
+        errors = {}
+        for existing_email, existing_username in User.objects.filter(
+            Q(email__iexact=email) | Q(username=username)
+        ).values_list('email', 'username'):
+            if existing_email.lower() == email.lower():
+                errors['email'] = 'A user with this email already exists.'
+            if existing_username == username:
+                errors['username'] = 'A user with this username already exists.'
+        
+        if errors:
+            raise serializers.ValidationError(errors)
         return attrs
     
     def create(self, validated_data):
-        """Create a new user with encrypted password."""
-        user = User.objects.create_user(**validated_data)
+        """
+        Create a new user with encrypted password.
+        
+        The unique constraints still decide concurrent signups that both
+        passed validate(); the losing INSERT is reported as a field error.
+        """
+        try:
+            user = User.objects.create_user(**validated_data)
+        except IntegrityError as e:
+            field = _unique_violation_field(e)
+            if field is None:
+                raise
+            raise serializers.ValidationError({
+                field: f'A user with this {field} already exists.'
+            })
         return user
 
 
@@ -82,24 +132,21 @@ class UserLoginSerializer(serializers.Serializer):
         password = attrs.get('password')
         
         if email and password:
-            user = authenticate(
-                request=self.context.get('request'),
-                email=email,
-                password=password
-            )
+            # Single backend, so fetch the row once instead of going through authenticate()
+            try:
+                user = User.objects.get(email=email)
+            except User.DoesNotExist:
+                # Hash anyway so unknown emails take as long as wrong passwords
+                User().set_password(password)
+                user = None
             
-            if not user:
+            # Disabled accounts get the same error, so a correct password isn't revealed
+            if user is None or not (user.check_password(password) and user.is_active):
                 raise serializers.ValidationError(
                     'Invalid email or password.',
                     code='authorization'
                 )
             
-            if not user.is_active:
-                raise serializers.ValidationError(
-                    'User account is disabled.',
-                    code='authorization'
-                )
-            
             attrs['user'] = user
             return attrs
         else:
@@ -118,4 +165,29 @@ class UserInfoSerializer(serializers.ModelSerializer):
             'id', 'username', 'email', 'role', 'phone_number', 
             'address', 'created_at', 'updated_at'
         )
-        read_only_fields = ('id', 'created_at', 'updated_at')
\ No newline at end of file
+        read_only_fields = ('id', 'created_at', 'updated_at')
+
+
+def _format_datetime(value):
+    """Render a datetime the way DRF's DateTimeField does by default."""
+    value = timezone.localtime(value).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def serialize_user(user):
+    """
+    Build the same representation as UserInfoSerializer without DRF's
+    per-field dispatch; used on every auth response.
+    """
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'role': user.role,
+        'phone_number': user.phone_number,
+        'address': user.address,
+        'created_at': _format_datetime(user.created_at),
+        'updated_at': _format_datetime(user.updated_at),
+    }
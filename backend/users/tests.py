@@ -1,12 +1,23 @@
-from django.test import TestCase
+import json
+import time
+from decimal import Decimal
+from importlib.util import find_spec
+from unittest import mock, skipUnless
+
+import jwt
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
-from rest_framework import status
-import json
-import jwt
 
-from .jwt_service import JWTService
+from .jwt_service import JWTService, _decode_verified
+from .serializers import UserInfoSerializer, UserRegistrationSerializer, serialize_user
 
 User = get_user_model()
 
@@ -47,6 +58,18 @@ class UserModelTests(TestCase):
         with self.assertRaises(ValueError):
             User.objects.create_user(None, 'testpass123')
     
+    def test_serialize_user_matches_user_info_serializer(self):
+        """Test the plain user representation matches UserInfoSerializer."""
+        user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            username='testuser',
+            phone_number='+1234567890',
+            address='123 Test Street'
+        )
+        
+        self.assertEqual(serialize_user(user), UserInfoSerializer(user).data)
+    
     def test_create_superuser(self):
         """Test creating a superuser."""
         user = User.objects.create_superuser(
@@ -63,9 +86,10 @@ class UserModelTests(TestCase):
 class JWTServiceTests(TestCase):
     """Test cases for JWT service functionality."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = User.objects.create_user(
             email='test@example.com',
             username='testuser',
             password='testpass123',
@@ -110,6 +134,64 @@ class JWTServiceTests(TestCase):
         with self.assertRaises(ValueError):
             JWTService.verify_token(access_token, 'refresh')
     
+    def test_verify_token_missing_user_id(self):
+        """Test verifying a signed token without a user_id claim."""
+        token = JWTService._encode({
+            'token_type': 'access',
+            'exp': int(time.time()) + 60,
+            'iat': int(time.time()),
+        })
+        
+        with self.assertRaises(jwt.InvalidTokenError):
+            JWTService.verify_token(token, 'access')
+    
+    def test_is_token_expired(self):
+        """Test expiry is read from the payload without verifying the token."""
+        self.assertFalse(JWTService.is_token_expired(JWTService.generate_access_token(self.user)))
+        
+        expired = JWTService._encode({'user_id': self.user.id, 'exp': int(time.time()) - 1})
+        self.assertTrue(JWTService.is_token_expired(expired))
+        self.assertIsNone(JWTService.is_token_expired('not-a-token'))
+    
+    def test_cached_user_excludes_password_hash(self):
+        """Test the user cached for authentication doesn't carry the password hash."""
+        cache.delete(JWTService.get_user_cache_key(self.user.id))
+        JWTService.get_user_from_payload({'user_id': self.user.id})
+        
+        cached = cache.get(JWTService.get_user_cache_key(self.user.id))
+        self.assertIn('password', cached.get_deferred_fields())
+    
+    def test_saving_user_evicts_cached_user(self):
+        """Test saving a user drops its cached copy so changes apply immediately."""
+        JWTService.get_user_from_payload({'user_id': self.user.id})
+        self.assertIsNotNone(cache.get(JWTService.get_user_cache_key(self.user.id)))
+        
+        self.user.save()
+        self.assertIsNone(cache.get(JWTService.get_user_cache_key(self.user.id)))
+    
+    def test_verify_token_reuses_decoded_payload(self):
+        """Test repeated verification of a token skips the signature check."""
+        _decode_verified.cache_clear()
+        token = JWTService.generate_access_token(self.user)
+        
+        with mock.patch('users.jwt_service.jwt.decode', wraps=jwt.decode) as decode:
+            first = JWTService.verify_token(token, 'access')
+            second = JWTService.verify_token(token, 'access')
+        
+        self.assertEqual(first, second)
+        self.assertEqual(decode.call_count, 1)
+    
+    def test_secret_key_change_invalidates_tokens(self):
+        """Test the cached secret key follows JWT_SECRET_KEY changes."""
+        token = JWTService.generate_access_token(self.user)
+        
+        with override_settings(JWT_SECRET_KEY='a-different-secret-key-used-only-in-tests'):
+            with self.assertRaises(jwt.InvalidTokenError):
+                JWTService.verify_token(token, 'access')
+        
+        payload = JWTService.verify_token(token, 'access')
+        self.assertEqual(payload['user_id'], self.user.id)
+    
     def test_get_user_from_token(self):
         """Test extracting user from token."""
         token = JWTService.generate_access_token(self.user)
@@ -134,16 +216,24 @@ class JWTServiceTests(TestCase):
 class AuthenticationAPITests(APITestCase):
     """Test cases for JWT authentication API endpoints."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.signup_url = reverse('users:signup')
-        self.login_url = reverse('users:login')
-        self.signout_url = reverse('users:signout')
-        self.userinfo_url = reverse('users:userinfo')
-        self.refresh_url = reverse('users:refresh_token')
-        self.verify_url = reverse('users:verify_token')
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.signup_url = reverse('users:signup')
+        cls.login_url = reverse('users:login')
+        cls.signout_url = reverse('users:signout')
+        cls.userinfo_url = reverse('users:userinfo')
+        cls.refresh_url = reverse('users:refresh_token')
+        cls.verify_url = reverse('users:verify_token')
+        
+        # Read-only tests share this user instead of creating their own
+        cls.shared_user = User.objects.create_user(
+            email='shared@example.com',
+            username='shared',
+            password='testpass123'
+        )
         
-        self.valid_user_data = {
+        cls.valid_user_data = {
             'username': 'testuser',
             'email': 'test@example.com',
             'password': 'testpass123',
@@ -173,15 +263,8 @@ class AuthenticationAPITests(APITestCase):
     
     def test_login_returns_jwt_tokens(self):
         """Test login returns JWT tokens."""
-        # Create a user first
-        User.objects.create_user(
-            email='test@example.com',
-            username='testuser',
-            password='testpass123'
-        )
-        
         login_data = {
-            'email': 'test@example.com',
+            'email': 'shared@example.com',
             'password': 'testpass123'
         }
         
@@ -198,23 +281,62 @@ class AuthenticationAPITests(APITestCase):
         self.assertIn('access_token', tokens)
         self.assertIn('refresh_token', tokens)
     
+    def test_unexpected_error_returns_logged_500(self):
+        """Test unexpected view errors become a logged 500 via the exception handler."""
+        with mock.patch.object(JWTService, 'generate_token_pair', side_effect=RuntimeError('boom')):
+            with self.assertLogs('users.exceptions', level='ERROR'):
+                response = self.client.post(
+                    self.login_url,
+                    {'email': 'shared@example.com', 'password': 'testpass123'},
+                    format='json'
+                )
+        
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertIn('error', response.data)
+    
     def test_userinfo_with_jwt_token(self):
         """Test accessing user info with JWT token."""
+        token = JWTService.generate_access_token(self.shared_user)
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = self.client.get(self.userinfo_url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('user', response.data)
+        self.assertEqual(response.data['user']['email'], 'shared@example.com')
+    
+    def test_userinfo_reuses_verified_token(self):
+        """Test a verified access token is not re-verified on the next request."""
+        cache.clear()
+        token = JWTService.generate_access_token(self.shared_user)
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        with mock.patch.object(JWTService, 'verify_token', wraps=JWTService.verify_token) as verify:
+            first = self.client.get(self.userinfo_url)
+            second = self.client.get(self.userinfo_url)
+        
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(verify.call_count, 1)
+    
+    def test_userinfo_rejects_deactivated_user(self):
+        """Test deactivating a user is not masked by the cached user lookup."""
         user = User.objects.create_user(
             email='test@example.com',
             username='testuser',
-            password='testpass123',
-            role='DRIVER'
+            password='testpass123'
         )
         
         token = JWTService.generate_access_token(user)
         
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-        response = self.client.get(self.userinfo_url)
+        self.assertEqual(self.client.get(self.userinfo_url).status_code, status.HTTP_200_OK)
         
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('user', response.data)
-        self.assertEqual(response.data['user']['email'], 'test@example.com')
+        user.is_active = False
+        user.save()
+        
+        response = self.client.get(self.userinfo_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
     
     def test_userinfo_without_token(self):
         """Test accessing user info without token."""
@@ -227,15 +349,15 @@ class AuthenticationAPITests(APITestCase):
         response = self.client.get(self.userinfo_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
     
+    def test_userinfo_with_malformed_bearer_header(self):
+        """Test a Bearer header carrying more than one value is rejected."""
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer first second')
+        response = self.client.get(self.userinfo_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
     def test_refresh_token_endpoint(self):
         """Test token refresh endpoint."""
-        user = User.objects.create_user(
-            email='test@example.com',
-            username='testuser',
-            password='testpass123'
-        )
-        
-        refresh_token = JWTService.generate_refresh_token(user)
+        refresh_token = JWTService.generate_refresh_token(self.shared_user)
         
         response = self.client.post(
             self.refresh_url,
@@ -248,13 +370,7 @@ class AuthenticationAPITests(APITestCase):
     
     def test_verify_token_endpoint(self):
         """Test token verification endpoint."""
-        user = User.objects.create_user(
-            email='test@example.com',
-            username='testuser',
-            password='testpass123'
-        )
-        
-        token = JWTService.generate_access_token(user)
+        token = JWTService.generate_access_token(self.shared_user)
         
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
         response = self.client.post(self.verify_url)
@@ -263,15 +379,25 @@ class AuthenticationAPITests(APITestCase):
         self.assertTrue(response.data['valid'])
         self.assertIn('user', response.data)
     
-    def test_signout_with_jwt(self):
-        """Test signing out with JWT token."""
-        user = User.objects.create_user(
-            email='test@example.com',
-            username='testuser',
-            password='testpass123'
+    def test_refresh_token_endpoint_rejects_access_token(self):
+        """Test the refresh endpoint refuses an access token."""
+        response = self.client.post(
+            self.refresh_url,
+            {'refresh_token': JWTService.generate_access_token(self.shared_user)},
+            format='json'
         )
         
-        token = JWTService.generate_access_token(user)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_refresh_token_endpoint_rejects_non_string_token(self):
+        """Test a non-string refresh token is rejected as invalid, not a server error."""
+        response = self.client.post(self.refresh_url, {'refresh_token': [1]}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_signout_with_jwt(self):
+        """Test signing out with JWT token."""
+        token = JWTService.generate_access_token(self.shared_user)
         
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
         response = self.client.post(self.signout_url)
@@ -279,6 +405,99 @@ class AuthenticationAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('message', response.data)
     
+    def test_signout_revokes_access_token(self):
+        """Test an access token stops authenticating once its owner signs out."""
+        token = JWTService.generate_access_token(self.shared_user)
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(self.client.get(self.userinfo_url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.post(self.signout_url).status_code, status.HTTP_200_OK)
+        
+        response = self.client.get(self.userinfo_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_signout_leaves_other_sessions_valid(self):
+        """Test revoking one device's access token doesn't revoke another's."""
+        phone = JWTService.generate_access_token(self.shared_user)
+        laptop = JWTService.generate_access_token(self.shared_user)
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {phone}')
+        self.assertEqual(self.client.post(self.signout_url).status_code, status.HTTP_200_OK)
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {laptop}')
+        response = self.client.get(self.userinfo_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_signout_revokes_refresh_token(self):
+        """Test a refresh token sent on signout can no longer be exchanged."""
+        tokens = JWTService.generate_token_pair(self.shared_user)
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access_token']}")
+        response = self.client.post(
+            self.signout_url,
+            {'refresh_token': tokens['refresh_token']},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.client.credentials()
+        response = self.client.post(
+            self.refresh_url,
+            {'refresh_token': tokens['refresh_token']},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_signout_ignores_other_users_refresh_token(self):
+        """Test signout does not revoke a refresh token belonging to someone else."""
+        other_user = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='testpass123'
+        )
+        other_tokens = JWTService.generate_token_pair(other_user)
+        tokens = JWTService.generate_token_pair(self.shared_user)
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access_token']}")
+        response = self.client.post(
+            self.signout_url,
+            {'refresh_token': other_tokens['refresh_token']},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.client.credentials()
+        response = self.client.post(
+            self.refresh_url,
+            {'refresh_token': other_tokens['refresh_token']},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_signout_with_non_object_body(self):
+        """Test signout accepts a JSON body that is not an object."""
+        tokens = JWTService.generate_token_pair(self.shared_user)
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access_token']}")
+        response = self.client.post(self.signout_url, ['refresh_token'], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_login_after_signout_issues_working_token(self):
+        """Test a token issued right after signing out is not caught by the blacklist."""
+        login_data = {'email': 'shared@example.com', 'password': 'testpass123'}
+        
+        first = self.client.post(self.login_url, login_data, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {first.data['tokens']['access_token']}")
+        self.assertEqual(self.client.post(self.signout_url).status_code, status.HTTP_200_OK)
+        
+        self.client.credentials()
+        second = self.client.post(self.login_url, login_data, format='json')
+        self.assertNotEqual(second.data['tokens']['access_token'], first.data['tokens']['access_token'])
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {second.data['tokens']['access_token']}")
+        response = self.client.get(self.userinfo_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
     def test_signup_password_mismatch(self):
         """Test signup fails when passwords don't match."""
         invalid_data = self.valid_user_data.copy()
@@ -293,6 +512,70 @@ class AuthenticationAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('error', response.data)
     
+    def test_signup_duplicate_email_ignores_case(self):
+        """Test signup rejects an email differing only in case."""
+        User.objects.create_user(
+            email='test@example.com',
+            username='existinguser',
+            password='testpass123'
+        )
+        
+        data = self.valid_user_data.copy()
+        data['email'] = 'TEST@example.com'
+        
+        response = self.client.post(self.signup_url, data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_signup_duplicate_email_and_username(self):
+        """Test signup reports both duplicate fields from one query."""
+        User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        
+        with self.assertNumQueries(1):
+            response = self.client.post(self.signup_url, self.valid_user_data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data['details'])
+        self.assertIn('username', response.data['details'])
+    
+    def test_signup_race_reports_constraint_field(self):
+        """Test a lost signup race is reported against the violated constraint."""
+        error = IntegrityError(
+            'duplicate key value violates unique constraint "users_username_key"\n'
+            'DETAIL:  Key (username)=(email_admin) already exists.'
+        )
+        data = {'username': 'email_admin', 'email': 'new@example.com', 'password': 'testpass123'}
+        
+        with mock.patch.object(User.objects, 'create_user', side_effect=error):
+            with self.assertRaises(serializers.ValidationError) as ctx:
+                UserRegistrationSerializer().create(data)
+        
+        self.assertEqual(list(ctx.exception.detail), ['username'])
+    
+    def test_login_disabled_account(self):
+        """Test login for an inactive user fails like wrong credentials."""
+        user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        user.is_active = False
+        user.save()
+        
+        response = self.client.post(
+            self.login_url,
+            {'email': 'test@example.com', 'password': 'testpass123'},
+            format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Invalid email or password.', str(response.data['details']))
+        self.assertNotIn('disabled', str(response.data['details']))
+    
     def test_login_invalid_credentials(self):
         """Test login with invalid credentials."""
         login_data = {
@@ -306,4 +589,32 @@ class AuthenticationAPITests(APITestCase):
             format='json'
         )
         
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@skipUnless(find_spec('orjson'), 'orjson is not installed')
+class ORJSONRendererTests(SimpleTestCase):
+    """Test cases for the orjson-backed response renderer."""
+    
+    def test_matches_json_renderer(self):
+        """Test orjson output is byte-identical to DRF's JSONRenderer."""
+        from .renderers import ORJSONRenderer
+        
+        data = {
+            'created_at': timezone.now(),
+            'amount': Decimal('12.50'),
+            'message': gettext_lazy('Token is valid'),
+            'name': 'Ng\u2019ang\u2019a \u2028',
+            'items': [1, 2.5, None, True],
+            1: 'non-string key',
+        }
+        
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+    
+    def test_large_integer_falls_back_to_json_renderer(self):
+        """Test integers orjson can't encode are rendered by DRF's JSONRenderer."""
+        from .renderers import ORJSONRenderer
+        
+        data = {'big': 2 ** 64, 'items': [-(2 ** 70)]}
+        
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
@@ -1,5 +1,5 @@
 import jwt
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
@@ -8,8 +8,9 @@ import logging
 from .serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
-    UserInfoSerializer
+    serialize_user
 )
+from .authentication import JWTAuthentication
 from .jwt_service import JWTService
 
 # Set up logging
@@ -24,37 +25,35 @@ def signup_view(request):
     
     Creates a new user account and returns JWT tokens for immediate authentication.
     """
-    try:
-        serializer = UserRegistrationSerializer(data=request.data)
-        
-        if serializer.is_valid():
+    serializer = UserRegistrationSerializer(data=request.data)
+    
+    if serializer.is_valid():
+        try:
             user = serializer.save()
-            
-            # Log successful registration
-            logger.info(f"New user registered: {user.email}")
-            
-            # Generate JWT token pair for immediate authentication
-            tokens = JWTService.generate_token_pair(user)
-            
-            # Return user info and tokens
-            user_serializer = UserInfoSerializer(user)
-            
+        except serializers.ValidationError as e:
+            # Lost a race with a concurrent signup for the same email/username
             return Response({
-                'message': 'User registered successfully',
-                'user': user_serializer.data,
-                'tokens': tokens
-            }, status=status.HTTP_201_CREATED)
+                'error': 'Registration failed',
+                'details': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response({
-            'error': 'Registration failed',
-            'details': serializer.errors
-        }, status=status.HTTP_400_BAD_REQUEST)
+        # Log successful registration
+        logger.info("New user registered: %s", user.email)
         
-    except Exception as e:
-        logger.error(f"Registration error: {str(e)}")
+        # Generate JWT token pair for immediate authentication
+        tokens = JWTService.generate_token_pair(user)
+        
+        # Return user info and tokens
         return Response({
-            'error': 'Internal server error during registration'
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            'message': 'User registered successfully',
+            'user': serialize_user(user),
+            'tokens': tokens
+        }, status=status.HTTP_201_CREATED)
+    
+    return Response({
+        'error': 'Registration failed',
+        'details': serializer.errors
+    }, status=status.HTTP_400_BAD_REQUEST)
 
 
 @api_view(['POST'])
@@ -65,40 +64,31 @@ def login_view(request):
     
     Authenticates users with email and password, returns JWT tokens.
     """
-    try:
-        serializer = UserLoginSerializer(
-            data=request.data,
-            context={'request': request}
-        )
+    serializer = UserLoginSerializer(
+        data=request.data,
+        context={'request': request}
+    )
+    
+    if serializer.is_valid():
+        user = serializer.validated_data['user']
         
-        if serializer.is_valid():
-            user = serializer.validated_data['user']
-            
-            # Generate JWT token pair
-            tokens = JWTService.generate_token_pair(user)
-            
-            # Log successful login
-            logger.info(f"User logged in: {user.email}")
-            
-            # Return user info and tokens
-            user_serializer = UserInfoSerializer(user)
-            
-            return Response({
-                'message': 'Login successful',
-                'user': user_serializer.data,
-                'tokens': tokens
-            }, status=status.HTTP_200_OK)
+        # Generate JWT token pair
+        tokens = JWTService.generate_token_pair(user)
         
-        return Response({
-            'error': 'Login failed',
-            'details': serializer.errors
-        }, status=status.HTTP_400_BAD_REQUEST)
+        # Log successful login
+        logger.info("User logged in: %s", user.email)
         
-    except Exception as e:
-        logger.error(f"Login error: {str(e)}")
+        # Return user info and tokens
         return Response({
-            'error': 'Internal server error during login'
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            'message': 'Login successful',
+            'user': serialize_user(user),
+            'tokens': tokens
+        }, status=status.HTTP_200_OK)
+    
+    return Response({
+        'error': 'Login failed',
+        'details': serializer.errors
+    }, status=status.HTTP_400_BAD_REQUEST)
 
 
 @api_view(['POST'])
@@ -111,29 +101,32 @@ def signout_view(request):
     Note: In a stateless JWT system, true logout requires token blacklisting
     or client-side token deletion.
     """
-    try:
-        user_email = request.user.email
-        
-        # Extract token from request
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if auth_header.startswith('Bearer '):
-            token = auth_header.split(' ')[1]
-            # Add token to blacklist (implementation depends on your blacklist strategy)
-            JWTService.blacklist_token(token)
-        
-        # Log successful logout
-        logger.info(f"User logged out: {user_email}")
-        
-        return Response({
-            'message': 'Logout successful',
-            'detail': 'Token has been invalidated. Please remove it from client storage.'
-        }, status=status.HTTP_200_OK)
+    # JWTAuthentication already extracted the access token into request.auth
+    token = request.auth
+    if token:
+        # Blacklist the token and stop serving it from the verified-token cache
+        JWTService.blacklist_token(token)
+        JWTAuthentication.forget_token(token)
+    
+    # Revoke the refresh token too so it can no longer mint new access tokens
+    refresh_token = request.data.get('refresh_token') if isinstance(request.data, dict) else None
+    if refresh_token:
+        try:
+            payload = JWTService.verify_token(refresh_token, 'refresh')
+        except (jwt.InvalidTokenError, ValueError):
+            payload = None
         
-    except Exception as e:
-        logger.error(f"Logout error: {str(e)}")
-        return Response({
-            'error': 'Internal server error during logout'
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # Only the caller's own refresh tokens may be revoked
+        if payload and payload.get('user_id') == request.user.id:
+            JWTService.blacklist_token(refresh_token)
+    
+    # Log successful logout
+    logger.info("User logged out: %s", request.user.email)
+    
+    return Response({
+        'message': 'Logout successful',
+        'detail': 'Token has been invalidated. Please remove it from client storage.'
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
@@ -145,18 +138,9 @@ def userinfo_view(request):
     Returns the authenticated user's information.
     JWT token is verified by the authentication middleware.
     """
-    try:
-        user_serializer = UserInfoSerializer(request.user)
-        
-        return Response({
-            'user': user_serializer.data
-        }, status=status.HTTP_200_OK)
-        
-    except Exception as e:
-        logger.error(f"User info error: {str(e)}")
-        return Response({
-            'error': 'Internal server error while fetching user info'
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return Response({
+        'user': serialize_user(request.user)
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
@@ -167,40 +151,33 @@ def refresh_token_view(request):
     
     Accepts a refresh token and returns a new access token.
     """
+    refresh_token = request.data.get('refresh_token')
+    
+    if not refresh_token:
+        return Response({
+            'error': 'Refresh token is required'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
     try:
-        refresh_token = request.data.get('refresh_token')
+        # Generate new token pair using refresh token
+        tokens = JWTService.refresh_access_token(refresh_token)
         
-        if not refresh_token:
-            return Response({
-                'error': 'Refresh token is required'
-            }, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'message': 'Token refreshed successfully',
+            'tokens': tokens
+        }, status=status.HTTP_200_OK)
         
-        try:
-            # Generate new token pair using refresh token
-            tokens = JWTService.refresh_access_token(refresh_token)
-            
-            return Response({
-                'message': 'Token refreshed successfully',
-                'tokens': tokens
-            }, status=status.HTTP_200_OK)
-            
-        except jwt.ExpiredSignatureError:
-            return Response({
-                'error': 'Refresh token has expired',
-                'detail': 'Please log in again'
-            }, status=status.HTTP_401_UNAUTHORIZED)
-            
-        except jwt.InvalidTokenError:
-            return Response({
-                'error': 'Invalid refresh token',
-                'detail': 'Please log in again'
-            }, status=status.HTTP_401_UNAUTHORIZED)
+    except jwt.ExpiredSignatureError:
+        return Response({
+            'error': 'Refresh token has expired',
+            'detail': 'Please log in again'
+        }, status=status.HTTP_401_UNAUTHORIZED)
         
-    except Exception as e:
-        logger.error(f"Token refresh error: {str(e)}")
+    except jwt.InvalidTokenError:
         return Response({
-            'error': 'Internal server error during token refresh'
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            'error': 'Invalid refresh token',
+            'detail': 'Please log in again'
+        }, status=status.HTTP_401_UNAUTHORIZED)
 
 
 @api_view(['POST'])
@@ -212,18 +189,9 @@ def verify_token_view(request):
     Verifies if the current token is valid and returns user information.
     Useful for client-side token validation.
     """
-    try:
-        # If we reach here, the token is valid (verified by authentication middleware)
-        user_serializer = UserInfoSerializer(request.user)
-        
-        return Response({
-            'valid': True,
-            'user': user_serializer.data,
-            'message': 'Token is valid'
-        }, status=status.HTTP_200_OK)
-        
-    except Exception as e:
-        logger.error(f"Token verification error: {str(e)}")
-        return Response({
-            'error': 'Internal server error during token verification'
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    # If we reach here, the token is valid (verified by authentication middleware)
+    return Response({
+        'valid': True,
+        'user': serialize_user(request.user),
+        'message': 'Token is valid'
+    }, status=status.HTTP_200_OK)